@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import collections
+import functools
+import os
 import time as time_module
-from src.data_loader import load_data_cached
+from src.data_loader import load_data_cached, load_data_uncached
 from src.analyzer import find_bumps_and_slides
-from src.visualizer import plot_pattern
+from src.visualizer import plot_pattern, get_pattern_window
 from src.data_validator import validate_dataset, get_yearly_duplicate_summary
 from src.news_provider import get_google_news_url
 from src.ui_utils import render_checkbox_dropdown, get_app_version
@@ -12,6 +16,9 @@ import argparse
 import sys
 
 # Parse CLI Args to Override Defaults
+# lru_cache: sys.argv never changes within a process, so the parser is built
+# and run once instead of on every Streamlit rerun.
+@functools.lru_cache(maxsize=1)
 def get_cli_args():
     parser = argparse.ArgumentParser(description="SP500 Bump & Slide App")
     # Use ignore_unknown to allow streamlit args if any leak
@@ -32,35 +39,135 @@ def get_cli_args():
 
 cli_args = get_cli_args()
 
+@st.cache_data(show_spinner=False)
+def _filter_years(_df: pd.DataFrame, years: tuple) -> pd.DataFrame:
+    """Year-filtered view of the dataset, memoized per year selection.
+
+    `_df` is excluded from the cache key (leading underscore) — it is the
+    cached loader output and never changes within a session, so hashing the
+    1.4M-row frame on every rerun would cost more than the filter itself.
+    """
+    # Nothing selected: empty frame, analysis is skipped downstream
+    if not years:
+        return _df.iloc[0:0]
+    # The loader precomputes an int16 'year' column; np.isin over the raw
+    # 2-byte codes is a single contiguous pass with a quarter of the memory
+    # traffic of deriving years from the datetime column.
+    if 'year' in _df.columns:
+        year_arr = _df['year'].to_numpy()
+        if years == tuple(range(years[0], years[-1] + 1)):
+            # Contiguous selection (the common case: all years, or one
+            # range): the frame is date-sorted, so the block is a single
+            # slice found by two binary searches — no O(N) mask at all.
+            start = np.searchsorted(year_arr, years[0], side='left')
+            end = np.searchsorted(year_arr, years[-1], side='right')
+            return _df.iloc[start:end].reset_index(drop=True)
+        mask = np.isin(year_arr, years)
+        return _df[mask].reset_index(drop=True)
+    return _df[_df['date'].dt.year.isin(years)].reset_index(drop=True)
+
+@st.cache_data(show_spinner=False)
+def _build_pattern_figure(_df, _row, match_idx, bump_len, slide_len, years_key):
+    """Plotly figure for a match, memoized by selection and pattern lengths.
+
+    Figure construction (traces + vrects) is the slow half of the viz path;
+    re-selecting a previously viewed match reuses the cached figure. `_df`
+    and `_row` are unhashed — (match_idx, years_key) identifies them.
+    """
+    return plot_pattern(_df, _row, bump_len=bump_len, slide_len=slide_len)
+
+@st.cache_data(show_spinner=False)
+def _day_time_mask(_df, years, dow_mask, time_start, time_end):
+    """Boolean row mask for the day/time filters, cached per selection.
+
+    Depends only on (years, days, time window), so parameter-only reruns
+    reuse it and the analyzer skips rebuilding both filter masks. Returns
+    None when the precomputed calendar columns are unavailable, letting the
+    analyzer fall back to its own filtering.
+    """
+    if 'mins' not in _df.columns or 'weekday' not in _df.columns:
+        return None
+    mins = _df['mins'].to_numpy()
+    t0_min = time_start.hour * 60 + time_start.minute
+    t1_min = time_end.hour * 60 + time_end.minute
+    if t0_min <= t1_min:
+        mask = (mins >= t0_min) & (mins <= t1_min)
+    else:
+        mask = (mins >= t0_min) | (mins <= t1_min)
+    mask &= ((1 << _df['weekday'].to_numpy()) & dow_mask) != 0
+    return mask
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _run_analysis(_df, years, bump_len, bump_thr, bump_type,
+                  slide_len, slide_thr, slide_type,
+                  min_bump_vol, min_slide_vol, time_start, time_end, dow_mask):
+    """Memoized analysis run: identical parameter sets hit the cache.
+
+    Toggling an unrelated widget (news topic, layout, debug panel) reruns
+    the script with the same analysis args; this makes that rerun an O(1)
+    lookup. `_df` is unhashed — the `years` tuple identifies the filtered
+    frame, which is itself cached per selection.
+    """
+    return find_bumps_and_slides(
+        _df,
+        bump_len, bump_thr, bump_type,
+        slide_len, slide_thr, slide_type,
+        min_bump_vol=min_bump_vol,
+        min_slide_vol=min_slide_vol,
+        time_range=(time_start, time_end),
+        days_of_week=dow_mask,
+        row_mask=_day_time_mask(_df, years, dow_mask, time_start, time_end),
+        # No progress bar needed for instant reactive updates unless slow
+    )
+
 # Performance Logging Utility
+# Console output is opt-in via SP500_PERF=1 so production reruns skip the
+# stdout syscalls; the sidebar panel appends only while profiling is enabled.
+PERF_TO_STDOUT = os.environ.get("SP500_PERF") == "1"
+
 def log_perf(label, start_time):
-    duration = time_module.time() - start_time
-    msg = f"[PERF] {label}: {duration:.4f}s"
-    print(msg)
-    if 'perf_logs' not in st.session_state:
-        st.session_state.perf_logs = []
-    st.session_state.perf_logs.append(msg)
-    return time_module.time() # Return new start time
+    duration = time_module.perf_counter() - start_time
+    if PERF_TO_STDOUT or st.session_state.get('debug_open'):
+        msg = f"[PERF] {label}: {duration:.4f}s"
+        if PERF_TO_STDOUT:
+            print(msg)
+        st.session_state.perf_logs.append(msg)
+    return time_module.perf_counter() # Return new start time
+
+# Threshold widget defaults per threshold type (percent vs absolute value).
+# Single lookup table instead of re-deriving labels/steps in branches each rerun.
+THRESH_CFG = {
+    "percent": {
+        "val": 0.34, "step": 0.01, "suffix": "(%)",
+        "bump_help": "Minimum percentage change required (e.g., 0.05 means 0.05%).",
+        "slide_help": "Minimum percentage change required during the slide (e.g., 0.05 means 0.05%).",
+    },
+    "value": {
+        "val": 0.50, "step": 0.05, "suffix": "(Price Difference)",
+        "bump_help": "Minimum price change required in dollars (e.g., 0.50 means 50 cents).",
+        "slide_help": "Minimum price change required during the slide in dollars.",
+    },
+}
+
+# Rows per page in the matches table (keeps the Arrow payload per rerun small)
+MATCHES_PAGE_SIZE = 100
 
 st.set_page_config(page_title="SP500 Bump & Slide", layout="wide")
 st.title("SP500 Bump & Slide Analysis")
 
-# Clear logs on rerun if needed, or keep history. 
-# For debugging single interaction, clearing is better.
-if 'perf_logs' not in st.session_state:
-    st.session_state.perf_logs = []
-else:
-    # Reset logs for this run
-    st.session_state.perf_logs = []
+# Bounded log buffer, reset per rerun so the panel shows a single
+# interaction. deque(maxlen=...) caps memory if a run logs excessively.
+st.session_state.perf_logs = collections.deque(maxlen=50)
 
-t0 = time_module.time()
-print(f"--- RERUN STARTED at {t0} ---")
+t0 = time_module.perf_counter()
+if PERF_TO_STDOUT:
+    print(f"--- RERUN STARTED at {t0} ---")
 
 # Load Data
 # Load Data
 with st.spinner("Loading data..."):
-    t_load_start = time_module.time()
-    df, val_report = load_data_cached("spy_data.parquet")
+    t_load_start = time_module.perf_counter()
+    df, val_report, all_years = load_data_cached("spy_data.parquet")
     t0 = log_perf("Data Load (Cached)", t_load_start)
 
 st.success(f"Loaded {len(df)} rows.")
@@ -71,7 +178,10 @@ has_issues = (val_report['duplicates']['count'] > 0) or \
              (len(val_report['missing_values']) > 0) or \
              (val_report['intraday_gaps']['count'] > 0)
 
-if has_issues:
+# Fragment: interacting with the tabs/downloads reruns only this block, and
+# a full-app rerun replays it without touching the (cached) report payloads.
+@st.fragment
+def render_validation_report(val_report):
     with st.expander("⚠️ Data Quality Issues Detected", expanded=False):
         tab1, tab2, tab3, tab4 = st.tabs(["Duplicates", "Missing Values", "Intraday Gaps", "Missing Minutes"])
         
@@ -79,7 +189,11 @@ if has_issues:
             count = val_report['duplicates']['count']
             if count > 0:
                 st.error(f"Found {count} duplicate timestamps.")
-                yearly_summary = get_yearly_duplicate_summary(val_report['duplicates']['data'])
+                # Precomputed inside the cached validation pass; fall back to
+                # computing it here for reports built before that change.
+                yearly_summary = val_report['duplicates'].get('yearly')
+                if yearly_summary is None:
+                    yearly_summary = get_yearly_duplicate_summary(val_report['duplicates']['data'])
                 st.write("Duplicates per Year:")
                 st.bar_chart(yearly_summary)
             else:
@@ -92,7 +206,7 @@ if has_issues:
                 st.write("Summary:", val_report['missing_values']['summary'])
                 st.dataframe(val_report['missing_values']['data'], width='stretch')
                 st.download_button("Download Missing Values CSV", 
-                                   val_report['missing_values']['data'].to_csv(index=False), 
+                                   val_report['missing_values']['csv'], 
                                    "missing_values.csv", 
                                    "text/csv")
             else:
@@ -104,7 +218,7 @@ if has_issues:
                 st.warning(f"Found {count} intraday gaps.")
                 st.dataframe(val_report['intraday_gaps']['data'], width='stretch')
                 st.download_button("Download Gaps CSV", 
-                                   val_report['intraday_gaps']['data'].to_csv(index=False), 
+                                   val_report['intraday_gaps']['csv'], 
                                    "intraday_gaps.csv", 
                                    "text/csv")
             else:
@@ -121,7 +235,7 @@ if has_issues:
                     st.dataframe(mm['data'], width='stretch')
                     
                     st.download_button("Download Missing Minutes Report", 
-                                       mm['data'].to_csv(index=False), 
+                                       mm['csv'], 
                                        "missing_minutes_report.csv", 
                                        "text/csv")
                 else:
@@ -129,11 +243,13 @@ if has_issues:
             else:
                 st.info("Validation report outdated. Please clear cache to see missing minutes.")
 
-# Auto-clean Duplicates
-if val_report['duplicates']['count'] > 0:
-    original_count = len(df)
-    df = df.drop_duplicates(subset=['date'], keep='first').reset_index(drop=True)
-    st.info(f"🧹 Auto-cleaned data: Removed {original_count - len(df)} duplicate rows. Analysis will proceed on {len(df)} unique rows.")
+if has_issues:
+    render_validation_report(val_report)
+
+# Auto-clean Duplicates (performed once inside the cached loader)
+removed_dups = val_report['duplicates'].get('removed_rows', 0)
+if removed_dups:
+    st.info(f"🧹 Auto-cleaned data: Removed {removed_dups} duplicate rows. Analysis will proceed on {len(df)} unique rows.")
 
 # Initialize Session State
 if 'results' not in st.session_state:
@@ -144,6 +260,8 @@ if 'stats' not in st.session_state:
 # Sidebar: Global Controls
 if st.sidebar.button("🔄 Reload Data", help="Clear cache and force reload from disk"):
     st.cache_data.clear()
+    st.cache_resource.clear()  # The loader lives in the resource cache
+    load_data_uncached.cache_clear()  # ...and memoizes in-process below it
     # Clear session state to ensure fresh analysis
     for key in ['results', 'selected_match_idx', 'preselected_done']:
         if key in st.session_state:
@@ -166,78 +284,96 @@ bump_thresh_type = st.sidebar.radio("Bump Threshold Type", ["percent", "value"],
 slide_thresh_type = st.sidebar.radio("Slide Threshold Type", ["percent", "value"], index=st_idx, help="Choose 'percent' for relative change (%) or 'value' for absolute price difference.")
 
 # Calculate defaults
-if bump_thresh_type == "percent":
-    b_val, b_step = 0.34, 0.01
-    b_label = "Bump Threshold (%)"
-    b_help = "Minimum percentage change required (e.g., 0.05 means 0.05%)."
-else:
-    b_val, b_step = 0.50, 0.05
-    b_label = "Bump Threshold (Price Difference)"
-    b_help = "Minimum price change required in dollars (e.g., 0.50 means 50 cents)."
+b_cfg = THRESH_CFG[bump_thresh_type]
+b_val, b_step = b_cfg["val"], b_cfg["step"]
+b_label = f"Bump Threshold {b_cfg['suffix']}"
+b_help = b_cfg["bump_help"]
 
 # CLI Override for Bump Threshold
 if cli_args.bump_thresh is not None:
     b_val = cli_args.bump_thresh
 
-if slide_thresh_type == "percent":
-    s_val, s_step = 0.34, 0.01
-    s_label = "Slide Threshold (%)"
-    s_help = "Minimum percentage change required during the slide (e.g., 0.05 means 0.05%)."
-else:
-    s_val, s_step = 0.50, 0.05
-    s_label = "Slide Threshold (Price Difference)"
-    s_help = "Minimum price change required during the slide in dollars."
+s_cfg = THRESH_CFG[slide_thresh_type]
+s_val, s_step = s_cfg["val"], s_cfg["step"]
+s_label = f"Slide Threshold {s_cfg['suffix']}"
+s_help = s_cfg["slide_help"]
 
 # CLI Override for Slide Threshold
 if cli_args.slide_thresh is not None:
     s_val = cli_args.slide_thresh
 
-# Sidebar Configuration (Reactive - No Form)
-st.sidebar.header("Bump Parameters")
+# Sidebar Configuration: parameters are batched in a form so the user can
+# adjust several knobs and trigger a single analysis rerun on Apply.
+with st.sidebar.form("analysis_params", border=False):
+    st.header("Bump Parameters")
+
+    # CLI Override for Bump Length
+    b_len_default = cli_args.bump_len if cli_args.bump_len is not None else 5
+    bump_len = st.slider("Bump Length (min)", 3, 20, b_len_default, help="Duration of the initial trend window in minutes.")
+    bump_threshold = st.number_input(b_label, min_value=0.0, value=float(b_val), step=b_step, format="%.2f", key=f"bump_th_{bump_thresh_type}", help=b_help)
 
-# CLI Override for Bump Length
-b_len_default = cli_args.bump_len if cli_args.bump_len is not None else 5
-bump_len = st.sidebar.slider("Bump Length (min)", 3, 20, b_len_default, help="Duration of the initial trend window in minutes.")
-bump_threshold = st.sidebar.number_input(b_label, min_value=0.0, value=float(b_val), step=b_step, format="%.2f", key=f"bump_th_{bump_thresh_type}", help=b_help)
+    st.header("Slide Parameters")
 
-st.sidebar.header("Slide Parameters")
+    # CLI Override for Slide Length
+    s_len_default = cli_args.slide_len if cli_args.slide_len is not None else 3
+    slide_len = st.slider("Slide Length (min)", 1, 20, s_len_default, help="Duration of the subsequent reaction window in minutes.")
+    slide_threshold = st.number_input(s_label, min_value=0.0, value=float(s_val), step=s_step, format="%.2f", key=f"slide_th_{slide_thresh_type}", help=s_help)
 
-# CLI Override for Slide Length
-s_len_default = cli_args.slide_len if cli_args.slide_len is not None else 3
-slide_len = st.sidebar.slider("Slide Length (min)", 1, 20, s_len_default, help="Duration of the subsequent reaction window in minutes.")
-slide_threshold = st.sidebar.number_input(s_label, min_value=0.0, value=float(s_val), step=s_step, format="%.2f", key=f"slide_th_{slide_thresh_type}", help=s_help)
+    st.header("Filters")
 
-st.sidebar.header("Filters")
+    # CLI Override for Filters
+    mbv_default = cli_args.min_bump_vol if cli_args.min_bump_vol is not None else 0
+    msv_default = cli_args.min_slide_vol if cli_args.min_slide_vol is not None else 0
 
-# CLI Override for Filters
-mbv_default = cli_args.min_bump_vol if cli_args.min_bump_vol is not None else 0
-msv_default = cli_args.min_slide_vol if cli_args.min_slide_vol is not None else 0
+    min_bump_vol = st.number_input("Min Bump Volume", min_value=0, value=mbv_default, step=1000, help="Minimum total volume traded during the Bump period.")
+    min_slide_vol = st.number_input("Min Slide Volume", min_value=0, value=msv_default, step=1000, help="Minimum total volume traded during the Slide period.")
 
-min_bump_vol = st.sidebar.number_input("Min Bump Volume", min_value=0, value=mbv_default, step=1000, help="Minimum total volume traded during the Bump period.")
-min_slide_vol = st.sidebar.number_input("Min Slide Volume", min_value=0, value=msv_default, step=1000, help="Minimum total volume traded during the Slide period.")
+    st.subheader("Time of Day (Bump Start)")
+    time_start = st.time_input("Start Time", time(9, 30), help="Only include patterns starting after this time.")
+    time_end = st.time_input("End Time", time(16, 0), help="Only include patterns starting before this time.")
 
-st.sidebar.subheader("Time of Day (Bump Start)")
-time_start = st.sidebar.time_input("Start Time", time(9, 30), help="Only include patterns starting after this time.")
-time_end = st.sidebar.time_input("End Time", time(16, 0), help="Only include patterns starting before this time.")
+    st.form_submit_button("Apply parameters", width="stretch")
 
 st.sidebar.subheader("Date Filters")
 
 # Year Selection (Excel-style)
-all_years = sorted(df['date'].dt.year.unique())
+# all_years comes precomputed from the cached loader
 # Use sidebar context for the custom component
 with st.sidebar:
     selected_years = render_checkbox_dropdown("Years", all_years, "filter_year")
     
-    # Day Selection (Excel-style)
+    # Day Selection: a single widget (one session-state entry) instead of the
+    # checkbox dropdown's per-day keys.
     days_options = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    days = render_checkbox_dropdown("Days of Week", days_options, "filter_day")
+    days = st.segmented_control(
+        "Days of Week",
+        options=days_options,
+        selection_mode="multi",
+        default=days_options,
+        format_func=lambda d: d[:3],
+        key="filter_days",
+    )
+
+# Encode the day selection as a bitmask (Monday=0) so the analyzer filters
+# with one bitwise AND instead of comparing day-name strings per row.
+dow_mask = 0
+for i, day_name in enumerate(days_options):
+    if day_name in days:
+        dow_mask |= (1 << i)
 
 st.sidebar.subheader("App Layout")
 layout_order = st.sidebar.radio("View Order", ["Table Top", "Chart Top"], index=0, horizontal=True)
+quick_chart = st.sidebar.toggle(
+    "Quick chart mode",
+    value=False,
+    help="Render a lightweight line chart instead of the Plotly candlestick (much smaller payload)."
+)
 
 # Show Debug Logs in Sidebar
 with st.sidebar.expander("Debug Profiling", expanded=False):
-    if 'perf_logs' in st.session_state:
+    st.toggle("Enable profiling", key="debug_open",
+              help="Collect per-stage timings on the next rerun.")
+    if st.session_state.get('debug_open') and st.session_state.perf_logs:
         st.code("\n".join(st.session_state.perf_logs))
 
 # Version Info
@@ -248,25 +384,23 @@ st.sidebar.markdown(f"**Date:** {ver['date']}")
 
 # Apply Filters to Dataframe globally (for Analysis and Viz consistency)
 # We must reset index so that results indices match the dataframe passed to Viz
-if len(selected_years) < len(all_years):
-    df_filtered = df[df['date'].dt.year.isin(selected_years)].reset_index(drop=True)
+years_changed = selected_years != tuple(all_years)
+if years_changed:
+    df_filtered = _filter_years(df, selected_years)
 else:
-    df_filtered = df.copy() # Copy to be safe if we modify it later (though we don't)
+    df_filtered = df # No mutation downstream; a defensive copy of the whole frame is wasted bandwidth
 
 # Run Logic (Reactive)
-t_analysis_start = time_module.time()
+t_analysis_start = time_module.perf_counter()
 
 # Only run if we have data selected
 if len(selected_years) > 0 and len(days) > 0:
-    results, stats = find_bumps_and_slides(
-        df_filtered,
+    results, stats = _run_analysis(
+        df_filtered, selected_years,
         bump_len, bump_threshold, bump_thresh_type,
         slide_len, slide_threshold, slide_thresh_type,
-        min_bump_vol=min_bump_vol,
-        min_slide_vol=min_slide_vol,
-        time_range=(time_start, time_end),
-        days_of_week=days,
-        # No progress bar needed for instant reactive updates unless slow
+        min_bump_vol, min_slide_vol,
+        time_start, time_end, dow_mask,
     )
     st.session_state.results = results
     st.session_state.stats = stats
@@ -274,13 +408,14 @@ if len(selected_years) > 0 and len(days) > 0:
     # Pre-select specific row if first run or requested
     # Target: 2020-04-06 13:53:00
     if 'preselected_done' not in st.session_state and not results.empty:
-        # Search for the target date
-        target_timestamp = pd.Timestamp("2020-04-06 13:53:00")
-        matches = results[results['date'] == target_timestamp]
-        
-        if not matches.empty:
-            target_idx = matches.index[0]
-            st.session_state.selected_match_idx = target_idx
+        # Binary search for the target date: results['date'] is monotonic
+        # (matches are discovered in time order), so no equality scan needed.
+        target_timestamp = np.datetime64("2020-04-06T13:53:00")
+        dates = results['date'].to_numpy()
+        i = np.searchsorted(dates, target_timestamp)
+
+        if i < len(dates) and dates[i] == target_timestamp:
+            st.session_state.selected_match_idx = results.index[i]
             st.session_state.preselected_done = True
             # We might need to rerun to reflect the selection immediately
             # But since we are inside the run logic, the selection logic below will pick it up
@@ -314,10 +449,27 @@ if st.session_state.results is not None:
         def render_table():
             st.subheader("Matches")
             st.caption("Click a row to visualize it.")
-            
+
+            # Paginate large result sets so each rerun only serializes one
+            # page to the browser instead of the full matches frame.
+            if len(results) > MATCHES_PAGE_SIZE:
+                last_page = (len(results) - 1) // MATCHES_PAGE_SIZE
+                # Keyed so the page survives unrelated reruns; clamp when a
+                # new analysis shrinks the result set below the stored page.
+                if st.session_state.get("results_page", 0) > last_page:
+                    st.session_state.results_page = 0
+                page = st.number_input(
+                    "Page", min_value=0, max_value=last_page, value=0,
+                    key="results_page",
+                    help=f"Showing {MATCHES_PAGE_SIZE} matches per page."
+                )
+            else:
+                page = 0
+            page_df = results.iloc[page * MATCHES_PAGE_SIZE : (page + 1) * MATCHES_PAGE_SIZE]
+
             # Interactive Table
             event = st.dataframe(
-                results, 
+                page_df,
                 width="stretch",
                 on_select="rerun",
                 selection_mode="single-row",
@@ -335,10 +487,13 @@ if st.session_state.results is not None:
             # Handle Table Selection
             if len(event.selection.rows) > 0:
                 selected_row_numeric_idx = event.selection.rows[0]
-                new_idx = results.index[selected_row_numeric_idx]
+                new_idx = page_df.index[selected_row_numeric_idx]
                 if 'selected_match_idx' not in st.session_state or new_idx != st.session_state.selected_match_idx:
                     st.session_state.selected_match_idx = new_idx
-                    st.rerun()
+                    if layout_order != "Table Top":
+                        # Chart already rendered above with the old selection;
+                        # repaint just this panel, not the whole script.
+                        st.rerun(scope="fragment")
 
         def render_chart():
             # Initialize match_idx logic
@@ -355,6 +510,11 @@ if st.session_state.results is not None:
                 st.subheader("Visualize Pattern")
                 
                 row = results.loc[match_idx]
+                # Pull the scalars out once: each Series __getitem__ goes
+                # through pandas indexing machinery on every repaint.
+                row_date = row['date']
+                bump_change = row['bump_change']
+                slide_change = row['slide_change']
                 
                 # --- Top Info Row: Metrics and News Selector ---
                 # Layout: Date | Bump | Slide | News Dropdown | Search Link
@@ -363,17 +523,17 @@ if st.session_state.results is not None:
                 info_col1, info_col2, info_col3, info_col4 = st.columns([2, 1, 1, 3])
                 
                 with info_col1:
-                    st.markdown(f"### {row['date'].date()}")
+                    st.markdown(f"### {row_date.date()}")
                 
                 with info_col2:
-                    st.metric("Bump", f"{row['bump_change']:.2f}%")
+                    st.metric("Bump", f"{bump_change:.2f}%")
                     
                 with info_col3:
-                    st.metric("Slide", f"{row['slide_change']:.2f}%")
+                    st.metric("Slide", f"{slide_change:.2f}%")
                     
                 with info_col4:
                     # Compact News Controls
-                    news_date_str = str(row['date'].date())
+                    news_date_str = str(row_date.date())
                     # Using a simpler layout for news to save vertical space
                     search_topic = st.text_input(
                         "News Topic", 
@@ -386,41 +546,63 @@ if st.session_state.results is not None:
                 st.divider()
 
                 # --- Chart Visualization (Full Width) ---
-                t_viz_start = time_module.time()
+                t_viz_start = time_module.perf_counter()
                 
                 chart_container = st.empty()
                 with chart_container.container():
                     st.info("⏳ **Generating visualization...**", icon="⏳")
                 
                 try:
-                    t_prep_start = time_module.time()
+                    t_prep_start = time_module.perf_counter()
                     # Use df_filtered to match the indices in results
-                    fig = plot_pattern(df_filtered, row, bump_len=bump_len, slide_len=slide_len)
-                    log_perf("Viz: Pattern Generation", t_prep_start)
-                    
-                    t_render_start = time_module.time()
-                    # Full width chart
-                    chart_container.plotly_chart(fig, width="stretch")
-                    log_perf("Viz: Render Call", t_render_start)
-                    
+                    if quick_chart:
+                        # Lightweight built-in chart: tiny Vega-Lite payload
+                        # instead of the full Plotly candlestick JSON.
+                        window = get_pattern_window(df_filtered, row, bump_len=bump_len, slide_len=slide_len)
+                        log_perf("Viz: Pattern Generation", t_prep_start)
+
+                        t_render_start = time_module.perf_counter()
+                        chart_container.line_chart(window.set_index('date')[['open', 'close']])
+                        log_perf("Viz: Render Call", t_render_start)
+                    else:
+                        fig = _build_pattern_figure(df_filtered, row, match_idx,
+                                                    bump_len, slide_len, selected_years)
+                        log_perf("Viz: Pattern Generation", t_prep_start)
+
+                        t_render_start = time_module.perf_counter()
+                        # Full width chart
+                        # Stable element key: lets the frontend diff against
+                        # the previous spec instead of remounting the chart.
+                        chart_container.plotly_chart(fig, width="stretch", key="pattern_chart")
+                        log_perf("Viz: Render Call", t_render_start)
+
                     log_perf("Viz: Total Flow", t_viz_start)
 
                 except Exception as e:
                     chart_container.error(f"Error loading visualization: {str(e)}")
 
-        # Execute Layout Order
-        if layout_order == "Table Top":
-            render_table()
-            st.divider()
-            render_chart()
-        else:
-            render_chart()
-            st.divider()
-            render_table()
+        # Execute Layout Order.
+        # One fragment wraps both views: a row click reruns only this panel
+        # (the dataframe widget lives inside it), never the full script. In
+        # Table Top order the chart renders after the selection handler, so
+        # no rerun is needed at all.
+        @st.fragment
+        def render_results_panel():
+            if layout_order == "Table Top":
+                render_table()
+                st.divider()
+                render_chart()
+            else:
+                render_chart()
+                st.divider()
+                render_table()
+
+        render_results_panel()
 
     else:
         st.info("No matches found with current parameters.")
 
-t_end = time_module.time()
+t_end = time_module.perf_counter()
 log_perf("Script Execution Complete", t0)
-print(f"--- RERUN ENDED at {t_end} (Duration: {t_end - t0:.4f}s) ---")
+if PERF_TO_STDOUT:
+    print(f"--- RERUN ENDED at {t_end} (Duration: {t_end - t0:.4f}s) ---")
@@ -1,8 +1,90 @@
 import pandas as pd
 import numpy as np
 
-def calculate_change(start_vals, end_vals, mode):
-    if mode == 'percent':
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional: without it the vectorized pandas path below runs.
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _scan_windows(open_arr, close_arr, vol_arr, bump_len, slide_len,
+                      pct_bump, pct_slide):
+        """
+        Fused single-pass scan computing bump/slide change and volume sums.
+
+        Window volumes use the incremental sliding-sum trick (add the row
+        entering the window, subtract the row leaving it), so the whole scan
+        is O(n) regardless of window length instead of O(n * W). Rows whose
+        window runs past the end stay NaN, matching the rolling/shift
+        semantics of the pandas path.
+        """
+        n = open_arr.shape[0]
+        bump_change = np.full(n, np.nan)
+        slide_change = np.full(n, np.nan)
+        bump_vol = np.full(n, np.nan)
+        slide_vol = np.full(n, np.nan)
+
+        # Sliding volume sums: one running accumulator per window kind.
+        run = 0.0
+        for j in range(n):
+            run += vol_arr[j]
+            if j >= bump_len:
+                run -= vol_arr[j - bump_len]
+            if j >= bump_len - 1:
+                bump_vol[j - bump_len + 1] = run
+        run = 0.0
+        for j in range(n):
+            run += vol_arr[j]
+            if j >= slide_len:
+                run -= vol_arr[j - slide_len]
+            # The slide window for candidate i spans [i+bump_len, i+bump_len
+            # +slide_len-1]; align the running sum back to i.
+            i = j - slide_len + 1 - bump_len
+            if i >= 0:
+                slide_vol[i] = run
+
+        for i in range(n):
+            bump_end = i + bump_len - 1
+            if bump_end < n:
+                o = open_arr[i]
+                c = close_arr[bump_end]
+                if pct_bump:
+                    if o != 0.0:
+                        bump_change[i] = (c - o) / o * 100.0
+                else:
+                    bump_change[i] = c - o
+            slide_end = i + bump_len + slide_len - 1
+            if slide_end < n:
+                o = open_arr[i + bump_len]
+                c = close_arr[slide_end]
+                if pct_slide:
+                    if o != 0.0:
+                        slide_change[i] = (c - o) / o * 100.0
+                else:
+                    slide_change[i] = c - o
+        return bump_change, slide_change, bump_vol, slide_vol
+
+    # Warm the kernel at import with a tiny input so the first interactive
+    # analysis never pays the JIT compile. All real calls share this one
+    # signature (float64 arrays + int lengths + bool flags): the type-flag
+    # branches are compile-time-uniform per call, so LLVM specializes both
+    # sides without needing a variant per parameter tuple. cache=True also
+    # persists the compiled object across process restarts.
+    _warm = np.zeros(2, dtype=np.float64)
+    _scan_windows(_warm, _warm, _warm, 1, 1, True, True)
+    del _warm
+
+_DAY_NAME_TO_DOW = {
+    'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+    'Friday': 4, 'Saturday': 5, 'Sunday': 6,
+}
+
+def calculate_change(start_vals, end_vals, as_percent):
+    """as_percent accepts the legacy 'percent'/'value' strings or a bool."""
+    if as_percent == 'percent' or as_percent is True:
         # Avoid division by zero
         return (end_vals - start_vals) / start_vals.replace(0, np.nan) * 100
     else:
@@ -14,7 +96,8 @@ def find_bumps_and_slides(
     slide_len, slide_threshold, slide_thresh_type,
     min_bump_vol=0, min_slide_vol=0,
     time_range=None, # (start_time, end_time)
-    days_of_week=None, # list of ints 0-6 or names
+    days_of_week=None, # int bitmask (bit i set = dayofweek i, Mon=0) or list of names
+    row_mask=None, # bool ndarray aligned with df rows; overrides time/day filters
     progress_callback=None # function(message, percent)
 ):
     """
@@ -28,103 +111,138 @@ def find_bumps_and_slides(
     slide_thresh_type: 'percent' or 'value'
     """
     
-    # 1. Pre-calculate Volume Sums (Rolling)
-    if progress_callback: progress_callback("Calculating volume metrics...", 10)
-    
-    # rolling sum aligns to the right edge of window, so we shift back to align to start
-    # We need rolling sum for bump_len and slide_len
-    
-    # Bump Volume (sum from i to i + bump_len - 1)
-    bump_vol = df['volume'].rolling(window=bump_len).sum().shift(-(bump_len - 1))
-    
-    # Slide Volume (sum from i + bump_len to i + bump_len + slide_len - 1)
-    # First get rolling sum of slide_len, aligned to start of slide
-    # Slide starts at i + bump_len
-    # So we want rolling sum at (i + bump_len + slide_len - 1) which is shift(-(bump_len + slide_len - 1)) ?
-    # Let's trace: 
-    # Rolling sum at index K is sum(K-L+1 ... K)
-    # We want sum for slide starting at J = i + bump_len.
-    # End of slide is J + slide_len - 1.
-    # So we want rolling_sum[J + slide_len - 1].
-    # J + slide_len - 1 = i + bump_len + slide_len - 1.
-    # So shift(-(bump_len + slide_len - 1)).
-    slide_vol = df['volume'].rolling(window=slide_len).sum().shift(-(bump_len + slide_len - 1))
-
-    # 2. Calculate Price Changes
-    if progress_callback: progress_callback("Analyzing price changes...", 30)
-
-    # Bump Change
-    bump_open = df['open']
-    bump_close = df['close'].shift(-(bump_len - 1))
-    bump_change = calculate_change(bump_open, bump_close, bump_thresh_type)
-    
-    # Slide Change %
-    slide_open = df['open'].shift(-bump_len)
-    slide_close = df['close'].shift(-(bump_len + slide_len - 1))
-    slide_change = calculate_change(slide_open, slide_close, slide_thresh_type)
-    
-    # 3. Create Candidate DataFrame
-    if progress_callback: progress_callback("Structuring candidate data...", 50)
-
-    # Use indices to track
-    candidates = pd.DataFrame({
-        'date': df['date'],
-        'bump_change': bump_change,
-        'slide_change': slide_change,
-        'bump_vol': bump_vol,
-        'slide_vol': slide_vol,
-        'bump_start_price': bump_open,
-        'bump_end_price': bump_close,
-        'slide_start_price': slide_open,
-        'slide_end_price': slide_close,
-        'bump_end_date': df['date'].shift(-(bump_len - 1)),
-        'slide_start_date': df['date'].shift(-bump_len),
-        'slide_end_date': df['date'].shift(-(bump_len + slide_len - 1))
-    })
-    
-    # 3.5 Apply Time and Day Filters (Moved before threshold filtering to calculate stats on valid scope)
+    # Resolve the threshold-type strings to bool flags once at entry; every
+    # downstream consumer (kernel and fallback) compares integers from here.
+    pct_bump = bump_thresh_type == 'percent'
+    pct_slide = slide_thresh_type == 'percent'
+
+    # 1+2. Window metrics: volume sums and price changes
+    if progress_callback: progress_callback("Calculating window metrics...", 10)
+
+    n = len(df)
+    if n == 0:
+        return pd.DataFrame(), {'total_bumps': 0, 'hits': 0, 'misses': 0, 'hit_ratio': 0}
+
+    if NUMBA_AVAILABLE:
+        # Fused JIT scan: one native pass over contiguous float64 arrays.
+        bump_change, slide_change, bump_vol, slide_vol = _scan_windows(
+            df['open'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            df['volume'].to_numpy(dtype=np.float64),
+            bump_len, slide_len,
+            pct_bump, pct_slide,
+        )
+    else:
+        # Pandas fallback.
+        # Window volume sums via the cumulative-sum difference: with
+        # c = cumsum(vol), sum(vol[a:b]) == c[b] - c[a], so both series come
+        # out of one O(n) pass instead of two pandas rolling engines.
+        # int64 cumsum keeps the sums exact; NaN pads the tail rows whose
+        # window runs past the end, matching rolling().shift() semantics.
+        vol = df['volume'].to_numpy()
+        c = np.concatenate(([0], np.cumsum(vol, dtype=np.int64)))
+        # Bump window for row i spans [i, i+bump_len-1]
+        bump_vol = np.full(n, np.nan)
+        if n >= bump_len:
+            bump_vol[:n - bump_len + 1] = c[bump_len:] - c[:-bump_len]
+        # Slide window for row i spans [i+bump_len, i+bump_len+slide_len-1]
+        slide_vol = np.full(n, np.nan)
+        m = n - bump_len - slide_len + 1
+        if m > 0:
+            slide_vol[:m] = (c[bump_len + slide_len : bump_len + slide_len + m]
+                             - c[bump_len : bump_len + m])
+
+        bump_close = df['close'].shift(-(bump_len - 1))
+        slide_open = df['open'].shift(-bump_len)
+        slide_close = df['close'].shift(-(bump_len + slide_len - 1))
+        bump_change = calculate_change(df['open'], bump_close, pct_bump).to_numpy()
+        slide_change = calculate_change(slide_open, slide_close, pct_slide).to_numpy()
+
+    # 3. Build the valid-row mask (time/day scope for stats and results).
+    # No wide candidates frame is materialized: the masks are computed over
+    # the full-length metric arrays and only surviving rows get gathered.
     if progress_callback: progress_callback("Applying time and day filters...", 60)
-    
-    if not candidates.empty:
+
+    if row_mask is not None:
+        # Caller supplied a precomputed (typically cached) day/time mask.
+        valid = np.asarray(row_mask, dtype=bool)
+    else:
+        valid = np.ones(n, dtype=bool)
         # Time of Day (based on Bump Start)
         if time_range:
             start_t, end_t = time_range
-            results_times = candidates['date'].dt.time
+            t0_min = start_t.hour * 60 + start_t.minute
+            t1_min = end_t.hour * 60 + end_t.minute
+            if 'mins' in df.columns:
+                # int16 minutes-since-midnight precomputed at load time:
+                # two narrow integer compares instead of per-row time objects.
+                mins = df['mins'].to_numpy()
+            else:
+                mins = (df['date'].dt.hour * 60 + df['date'].dt.minute).to_numpy()
             # Handle overnight ranges if needed, but assuming intraday for now
-            if start_t <= end_t:
-                candidates = candidates[(results_times >= start_t) & (results_times <= end_t)]
+            if t0_min <= t1_min:
+                valid &= (mins >= t0_min) & (mins <= t1_min)
             else:
-                candidates = candidates[(results_times >= start_t) | (results_times <= end_t)]
-        
-        # Day of Week
+                valid &= (mins >= t0_min) | (mins <= t1_min)
+
+        # Day of Week: both forms resolve to int dayofweek codes, so the
+        # per-row work is integer compares either way.
         if days_of_week:
-            # days_of_week expected to be list of day names (Mon, Tue...) or integers
-            # Let's standardize on day_name()
-            candidates = candidates[candidates['date'].dt.day_name().isin(days_of_week)]
+            if 'weekday' in df.columns:
+                dow = df['weekday'].to_numpy()
+            else:
+                dow = df['date'].dt.dayofweek.to_numpy()
+            if isinstance(days_of_week, int):
+                # Bitmask with bit i set for dayofweek i (Monday=0): a single
+                # bitwise AND over int codes instead of per-row string compares.
+                valid &= ((1 << dow) & days_of_week) != 0
+            else:
+                # Legacy path: list of day names (Mon, Tue...) mapped to
+                # codes once instead of a string isin per row.
+                codes = [_DAY_NAME_TO_DOW[d] for d in days_of_week]
+                valid &= np.isin(dow, codes)
 
-    # 4. Filter by Thresholds and Volume
+    # 4. Filter by Thresholds and Volume.
+    # NaN metrics (windows running past the end) compare False and drop out
+    # here, which is what the old dropna() on the results achieved.
     if progress_callback: progress_callback("Filtering candidates...", 70)
 
-    if candidates.empty:
-         return pd.DataFrame(), {'total_bumps': 0, 'hits': 0, 'misses': 0, 'hit_ratio': 0}
+    bump_mask = valid & (np.abs(bump_change) >= bump_threshold) & (bump_vol >= min_bump_vol)
+    slide_mask = valid & (np.abs(slide_change) >= slide_threshold) & (slide_vol >= min_slide_vol)
+    hit_mask = bump_mask & slide_mask
+
+    total_bumps = int(bump_mask.sum())
+    hits = int(hit_mask.sum())
 
-    # Calculate masks
-    bump_mask = (candidates['bump_change'].abs() >= bump_threshold) & (candidates['bump_vol'] >= min_bump_vol)
-    slide_mask = (candidates['slide_change'].abs() >= slide_threshold) & (candidates['slide_vol'] >= min_slide_vol)
-    
-    total_bumps = bump_mask.sum()
-    hits = (bump_mask & slide_mask).sum()
-    misses = (bump_mask & ~slide_mask).sum()
-    
     stats = {
-        'total_bumps': int(total_bumps),
-        'hits': int(hits),
-        'misses': int(misses),
+        'total_bumps': total_bumps,
+        'hits': hits,
+        'misses': total_bumps - hits,
         'hit_ratio': float((hits / total_bumps * 100) if total_bumps > 0 else 0)
     }
 
-    results = candidates[bump_mask & slide_mask].copy()
-
+    # 5. Materialize only the surviving rows: a handful of gathers over the
+    # source columns instead of a 12-column full-length intermediate.
     if progress_callback: progress_callback("Finalizing results...", 100)
-    
-    return results.dropna(), stats
+
+    idx = np.flatnonzero(hit_mask)
+    dates = df['date'].to_numpy()
+    open_arr = df['open'].to_numpy()
+    close_arr = df['close'].to_numpy()
+    # Survivors have non-NaN slide metrics, so every offset below is in range
+    results = pd.DataFrame({
+        'date': dates[idx],
+        'bump_change': bump_change[idx],
+        'slide_change': slide_change[idx],
+        'bump_vol': bump_vol[idx],
+        'slide_vol': slide_vol[idx],
+        'bump_start_price': open_arr[idx],
+        'bump_end_price': close_arr[idx + bump_len - 1],
+        'slide_start_price': open_arr[idx + bump_len],
+        'slide_end_price': close_arr[idx + bump_len + slide_len - 1],
+        'bump_end_date': dates[idx + bump_len - 1],
+        'slide_start_date': dates[idx + bump_len],
+        'slide_end_date': dates[idx + bump_len + slide_len - 1],
+    }, index=idx)
+
+    return results, stats
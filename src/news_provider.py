@@ -1,10 +1,20 @@
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import quote_plus
 
-def get_google_news_url(date_str, query="S&P 500"):
+# Every caller today uses the default query, so its encoding is baked in
+# once at import; only custom queries pay quote_plus on a cache miss.
+_DEFAULT_QUERY = "S&P 500"
+_DEFAULT_ENCODED_QUERY = quote_plus(_DEFAULT_QUERY)
+
+@lru_cache(maxsize=4096)
+def get_google_news_url(date_str, query=_DEFAULT_QUERY):
     """
     Generates a Google News search URL for the specific date.
     date_str: 'YYYY-MM-DD'
+
+    Memoized: the chart panel rebuilds the link on every repaint, and the
+    (date, query) space a user actually touches is tiny.
     """
     # Format: https://www.google.com/search?q=QUERY&tbs=cdr:1,cd_min:MM/DD/YYYY,cd_max:MM/DD/YYYY&tbm=nws
     try:
@@ -12,7 +22,10 @@ def get_google_news_url(date_str, query="S&P 500"):
         formatted_date = dt.strftime('%m/%d/%Y')
         
         # Proper encoding handles spaces and symbols like '&'
-        encoded_query = quote_plus(query)
+        if query == _DEFAULT_QUERY:
+            encoded_query = _DEFAULT_ENCODED_QUERY
+        else:
+            encoded_query = quote_plus(query)
         
         url = (
             f"https://www.google.com/search?q={encoded_query}"
@@ -1,14 +1,20 @@
 import streamlit as st
 import subprocess
 
+@st.cache_resource
 def get_app_version():
     """
     Returns a dictionary with version info: hash, count, date.
+
+    Cached per process: the git subprocesses would otherwise run on every
+    rerun just to render the sidebar footer. The hash and date come from one
+    git log call, so the cold path forks twice instead of three times.
     """
     try:
-        short_hash = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD']).decode('ascii').strip()
+        short_hash, date = subprocess.check_output(
+            ['git', 'log', '-1', '--format=%h|%cd', '--date=format:%Y-%m-%d %H:%M']
+        ).decode('ascii').strip().split('|')
         count = subprocess.check_output(['git', 'rev-list', '--count', 'HEAD']).decode('ascii').strip()
-        date = subprocess.check_output(['git', 'show', '-s', '--format=%cd', '--date=format:%Y-%m-%d %H:%M', 'HEAD']).decode('ascii').strip()
         return {
             "hash": short_hash,
             "count": count,
@@ -24,54 +30,57 @@ def get_app_version():
 def render_checkbox_dropdown(label, options, key_prefix, default_all=True):
     """
     Renders an Excel-style dropdown with checkboxes and 'Select All'.
-    Returns a list of selected options.
+    Returns a tuple of selected options (in options order). A tuple keeps
+    the value stable and hashable, so callers can compare selections and
+    feed them straight into @st.cache_data keys without churn.
     """
     # Initialize session state for this component if not present
     all_key = f"{key_prefix}_all"
-    
+    # Build every per-option key once and keep the tuple in session state, so
+    # reruns skip even the f-string formatting (the passes below -- init,
+    # callbacks, count, render -- all reuse it).
+    keys_key = f"{key_prefix}_keys"
+    opt_keys = st.session_state.get(keys_key)
+    if opt_keys is None or len(opt_keys) != len(options):
+        opt_keys = tuple(f"{key_prefix}_{opt}" for opt in options)
+        st.session_state[keys_key] = opt_keys
+
     # Check if we need to initialize individual keys
     # We do this once or if the options list changes drastically (simple check)
     if all_key not in st.session_state:
         st.session_state[all_key] = default_all
-        for opt in options:
-            st.session_state[f"{key_prefix}_{opt}"] = default_all
+        for k in opt_keys:
+            st.session_state[k] = default_all
 
     # Callback for Select All
     def toggle_all():
         new_state = st.session_state[all_key]
-        for opt in options:
-            st.session_state[f"{key_prefix}_{opt}"] = new_state
+        for k in opt_keys:
+            st.session_state[k] = new_state
 
     # Callback for Individual Item (Updates Select All visual state)
     def toggle_item():
-        # If any item is unchecked, Select All should be unchecked
-        # If all items are checked, Select All should be checked
-        all_checked = True
-        for opt in options:
-            if not st.session_state.get(f"{key_prefix}_{opt}", False):
-                all_checked = False
-                break
-        st.session_state[all_key] = all_checked
+        # Select All mirrors whether every individual box is checked
+        st.session_state[all_key] = all(
+            st.session_state.get(k, False) for k in opt_keys
+        )
 
-    # UI Rendering
-    selected_items = []
-    
     # Calculate count for the label (e.g., "Years (5 selected)")
     # We need to peek at current state (or default)
-    current_selected_count = 0
-    for opt in options:
-        if st.session_state.get(f"{key_prefix}_{opt}", default_all):
-            current_selected_count += 1
-            
+    current_selected_count = sum(
+        1 for k in opt_keys if st.session_state.get(k, default_all)
+    )
+
+    # UI Rendering: checkboxes bind to session state; the selection is
+    # harvested afterwards in one comprehension over that state rather than
+    # being threaded through the render loop.
     with st.expander(f"{label} ({current_selected_count})", expanded=False):
         # Select All Checkbox
         st.checkbox("(Select All)", key=all_key, on_change=toggle_all)
-        
-        # Individual Checkboxes
-        for opt in options:
-            # We use the key directly to bind to session state
-            is_checked = st.checkbox(str(opt), key=f"{key_prefix}_{opt}", on_change=toggle_item)
-            if is_checked:
-                selected_items.append(opt)
-                
-    return selected_items
+
+        # Individual Checkboxes (keys bind them to session state)
+        for opt, k in zip(options, opt_keys):
+            st.checkbox(str(opt), key=k, on_change=toggle_item)
+
+    return tuple(opt for opt, k in zip(options, opt_keys)
+                 if st.session_state.get(k, False))
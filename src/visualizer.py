@@ -1,32 +1,61 @@
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 
-def plot_pattern(df, match_row, padding=10, bump_len=None, slide_len=None):
+try:
+    # orjson serializes numpy arrays in C; the default engine walks them
+    # element-wise through Python floats. Figure JSON encode is the bulk of
+    # st.plotly_chart time, so switch engines when orjson is installed.
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+def _window_bounds(df, match_row, padding=10, bump_len=None, slide_len=None):
     """
-    Plots a specific pattern (Bump + Slide) with context using subplots for Price and Volume.
+    Returns the inclusive (start, end) row positions of the pattern window.
     """
-    
     # We use the index from match_row to find location in df
     start_idx = match_row.name
-    start_date = match_row['date']
 
     # Optimization: If lengths are provided, we can calculate end index directly
     if bump_len is not None and slide_len is not None:
         # Pattern covers indices [start_idx, start_idx + bump_len + slide_len - 1]
         end_pos = start_idx + bump_len + slide_len - 1
     else:
-        # Fallback: Find index of slide_end_date using search
+        # Fallback: Find index of slide_end_date using search. to_numpy() is
+        # a zero-copy view, so the bisect runs over the contiguous array
+        # without the Series __array__ conversion on every call.
         slide_end_date = match_row['slide_end_date']
-        end_pos = np.searchsorted(df['date'], slide_end_date)
+        end_pos = np.searchsorted(df['date'].to_numpy(), slide_end_date)
         if end_pos >= len(df): end_pos = len(df) - 1
-    
+
     plot_start_idx = max(0, start_idx - padding)
     plot_end_idx = min(len(df) - 1, end_pos + padding)
-    
-    plot_data = df.iloc[plot_start_idx : plot_end_idx + 1]
-    
+
+    return plot_start_idx, plot_end_idx
+
+def get_pattern_window(df, match_row, padding=10, bump_len=None, slide_len=None):
+    """
+    Returns the slice of df covering the pattern (Bump + Slide) plus padding.
+    """
+    plot_start_idx, plot_end_idx = _window_bounds(
+        df, match_row, padding=padding, bump_len=bump_len, slide_len=slide_len)
+    return df.iloc[plot_start_idx : plot_end_idx + 1]
+
+def plot_pattern(df, match_row, padding=10, bump_len=None, slide_len=None):
+    """
+    Plots a specific pattern (Bump + Slide) with context using subplots for Price and Volume.
+    """
+    start_date = match_row['date']
+    # Slice only the six columns Plotly consumes, as numpy views: no
+    # BlockManager row-slice over auxiliary columns and no Series wrappers.
+    lo, hi = _window_bounds(df, match_row, padding=padding, bump_len=bump_len, slide_len=slide_len)
+    plot_data = {c: df[c].to_numpy()[lo : hi + 1]
+                 for c in ('date', 'open', 'high', 'low', 'close', 'volume')}
+
     # Create Subplots: Price (Top), Volume (Bottom)
     fig = make_subplots(
         rows=2, cols=1, 
@@ -35,25 +64,38 @@ def plot_pattern(df, match_row, padding=10, bump_len=None, slide_len=None):
         row_heights=[0.7, 0.3]
     )
     
+    # Hand Plotly ms-precision dates and float32 values: the serializer's
+    # array fast path applies and the JSON pushed to the browser roughly
+    # halves. Minute bars and display precision lose nothing at ms/FP32.
+    x = plot_data['date'].astype('datetime64[ms]')
+    f32 = {k: plot_data[k].astype(np.float32)
+           for k in ('open', 'high', 'low', 'close', 'volume')}
+
     # 1. Candlestick (Wickless: line width 0)
     fig.add_trace(go.Candlestick(
-        x=plot_data['date'],
-        open=plot_data['open'],
-        high=plot_data['high'],
-        low=plot_data['low'],
-        close=plot_data['close'],
+        x=x,
+        open=f32['open'],
+        high=f32['high'],
+        low=f32['low'],
+        close=f32['close'],
         name='Price',
         increasing_line=dict(width=0), # Hide wicks
         decreasing_line=dict(width=0), # Hide wicks
     ), row=1, col=1)
-    
+
     # 2. Volume Bar
-    # Color volume bars based on close >= open (standard trading convention)
-    colors = ['#00CC96' if c >= o else '#EF553B' for c, o in zip(plot_data['close'], plot_data['open'])]
-    
+    # Color volume bars based on close >= open (standard trading convention).
+    # The loader precomputes the comparison as an int8 'up' column; frames
+    # without it (ad-hoc input) fall back to comparing the float columns.
+    if 'up' in df.columns:
+        up = df['up'].to_numpy()[lo : hi + 1].view(bool)
+    else:
+        up = plot_data['close'] >= plot_data['open']
+    colors = np.where(up, '#00CC96', '#EF553B')
+
     fig.add_trace(go.Bar(
-        x=plot_data['date'],
-        y=plot_data['volume'],
+        x=x,
+        y=f32['volume'],
         name='Volume',
         marker_color=colors
     ), row=2, col=1)
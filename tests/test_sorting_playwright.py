@@ -1,6 +1,12 @@
-from playwright.sync_api import sync_playwright
 import time
 
+import pytest
+
+# Browser automation is optional tooling; skip cleanly where playwright
+# (and its bundled chromium) is not installed.
+playwright_api = pytest.importorskip("playwright.sync_api")
+sync_playwright = playwright_api.sync_playwright
+
 def test_table_sorting():
     with sync_playwright() as p:
         # Launch browser